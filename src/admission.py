@@ -0,0 +1,185 @@
+"""
+Admission control for LLM calls.
+
+A single Ollama instance serves every session, so calls go through a bounded
+queue with a per-request deadline. Requests that can't be served in time are
+shed and the caller answers from the retrieved reviews instead.
+"""
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError
+
+
+class OverloadedError(Exception):
+    """Raised when an LLM call is shed or misses its deadline"""
+
+
+class AdmissionController:
+    def __init__(self, max_concurrent=1, max_queue=8, deadline=30.0, service_estimate=10.0):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.deadline = deadline
+
+        # Waiters get slots strictly in arrival order (a Semaphore doesn't guarantee that)
+        self._lock = threading.Condition()
+        self._queue = deque()
+        self._free = max_concurrent
+        self._running = {}  # call token -> start time
+
+        self._admitted = 0
+        self._shed = 0
+        self._timed_out = 0
+        self._wait_samples = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        # Moving average of LLM call duration, seeded so a cold-start burst is
+        # shed on queue position instead of waiting out the whole deadline
+        self._avg_service = service_estimate
+
+    def _service_time(self):
+        # A call that has been running longer than the average means the
+        # backend is slow or hung right now, so trust that over the average
+        now = time.monotonic()
+        oldest = max((now - started for started in self._running.values()), default=0.0)
+        return max(self._avg_service, oldest)
+
+    def _estimated_wait(self, service):
+        # Everyone queued ahead plus the calls already running
+        ahead = len(self._queue) + len(self._running)
+        return ahead * service / self.max_concurrent
+
+    def _idle(self):
+        return not self._queue and not self._running
+
+    def _record_wait(self, waited):
+        self._wait_samples += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+
+    def _release(self, token):
+        with self._lock:
+            duration = time.monotonic() - self._running.pop(token)
+            # Capped so one very slow call can't push the average past the
+            # deadline and shed everything from then on
+            self._avg_service = 0.8 * self._avg_service + 0.2 * min(duration, self.deadline)
+            self._free += 1
+            self._lock.notify_all()
+
+    def _acquire(self, timeout):
+        """Wait for a slot in FIFO order. Must be called with the lock held."""
+        ticket = object()
+        self._queue.append(ticket)
+        acquired = self._lock.wait_for(lambda: self._queue[0] is ticket and self._free > 0, timeout=timeout)
+        self._queue.remove(ticket)
+        if acquired:
+            self._free -= 1
+        # The head of the queue changed either way
+        self._lock.notify_all()
+        return acquired
+
+    def run(self, fn, payload, deadline=None):
+        """
+        Call fn(payload) once a slot is free and return its result.
+        Raises OverloadedError if the queue is full, the deadline is expected to
+        be missed, or the deadline passes while waiting or running.
+        """
+        deadline = self.deadline if deadline is None else deadline
+        start = time.monotonic()
+
+        with self._lock:
+            if len(self._queue) >= self.max_queue:
+                self._shed += 1
+                raise OverloadedError("queue is full")
+            # With nothing queued or running, always let the call through as a
+            # probe so the average can recover after a slow spell
+            service = self._service_time()
+            if not self._idle() and self._estimated_wait(service) + service > deadline:
+                self._shed += 1
+                raise OverloadedError("deadline can't be met at current load")
+
+            acquired = self._acquire(timeout=deadline)
+            waited = time.monotonic() - start
+            self._record_wait(waited)
+            if not acquired:
+                self._shed += 1
+                raise OverloadedError("deadline passed while queued")
+
+            # Don't tie up Ollama with a call whose answer would arrive too late,
+            # unless it's the only call and so the only way to get a fresh sample
+            remaining = deadline - waited
+            if remaining <= 0 or (self._running and remaining < self._service_time()):
+                self._shed += 1
+                self._free += 1
+                self._lock.notify_all()
+                raise OverloadedError("not enough time left after queueing")
+
+            token = object()
+            self._running[token] = time.monotonic()
+            self._admitted += 1
+
+        # The slot stays taken until the call really finishes, even if we stop
+        # waiting for it, since Ollama is still busy with it. Daemon thread so an
+        # abandoned call doesn't keep the process alive on exit.
+        future = Future()
+
+        def call():
+            try:
+                future.set_result(fn(payload))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                self._release(token)
+
+        threading.Thread(target=call, daemon=True).start()
+
+        try:
+            return future.result(timeout=remaining)
+        except TimeoutError:
+            with self._lock:
+                self._timed_out += 1
+            raise OverloadedError("deadline passed while generating")
+
+    def metrics(self):
+        """Snapshot of queue depth, wait times and shed counts"""
+        with self._lock:
+            return {
+                "queue_depth": len(self._queue),
+                "in_flight": len(self._running),
+                "admitted": self._admitted,
+                "shed": self._shed,
+                "timed_out": self._timed_out,
+                "avg_wait": self._total_wait / self._wait_samples if self._wait_samples else 0.0,
+                "max_wait": self._max_wait,
+            }
+
+
+def controller_from_env():
+    """
+    Build a controller configured from LLM_MAX_CONCURRENT, LLM_MAX_QUEUE,
+    LLM_DEADLINE_SECONDS and LLM_SERVICE_ESTIMATE_SECONDS
+    """
+    return AdmissionController(
+        max_concurrent=int(os.getenv("LLM_MAX_CONCURRENT", 1)),
+        max_queue=int(os.getenv("LLM_MAX_QUEUE", 8)),
+        deadline=float(os.getenv("LLM_DEADLINE_SECONDS", 30)),
+        service_estimate=float(os.getenv("LLM_SERVICE_ESTIMATE_SECONDS", 10)),
+    )
+
+
+def degraded_answer(reviews, limit=3, snippet_length=200):
+    """
+    Fast answer built straight from the top retrieved reviews,
+    used when the LLM can't respond in time.
+    """
+    if not reviews:
+        return "We're very busy right now and couldn't find any reviews about that. Please try again in a moment."
+
+    lines = ["We're very busy right now, so here's what customers say in the most relevant reviews:", ""]
+    for doc in reviews[:limit]:
+        snippet = doc.page_content
+        if len(snippet) > snippet_length:
+            snippet = snippet[:snippet_length].rsplit(" ", 1)[0] + "..."
+        lines.append(f"- ({doc.metadata['rating']}/5) {snippet}")
+    return "\n".join(lines)
@@ -4,11 +4,16 @@ from langchain_ollama.llms import OllamaLLM
 from langchain_core.prompts import ChatPromptTemplate
 from vector import retriever, df
 from order_tool import send_order_email, is_order_intent
+from build_assets import STATIC_DIR, BACKGROUND_FILE, file_version
+from admission import controller_from_env, degraded_answer, OverloadedError
 import altair as alt
 from datetime import datetime
 import base64
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 # Page configuration
 st.set_page_config(
     page_title="🍕 Pizza Restaurant Assistant",
@@ -17,7 +22,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Load and encode background image
+# Background image: prefer the prebuilt static asset (see build_assets.py),
+# fall back to inlining the original image if the build step wasn't run
 @st.cache_data
 def get_base64_image(image_path):
     if os.path.exists(image_path):
@@ -25,16 +31,41 @@ def get_base64_image(image_path):
             return base64.b64encode(img_file.read()).decode()
     return None
 
-bg_image = get_base64_image("image.jpg")
+@st.cache_data
+def get_static_url(static_path, mtime):
+    # Keyed on mtime so a rebuilt file gets a new version without re-hashing every rerun
+    return f"app/static/{os.path.basename(static_path)}?v={file_version(static_path)}"
+
+@st.cache_resource
+def warn_missing_static(static_path):
+    # cache_resource makes this run once per process instead of on every rerun
+    logger.warning(
+        "%s not found, inlining image.jpg on every rerun. Run build_assets.py to serve it as a static file.",
+        static_path
+    )
+
+def get_background_url():
+    # Not cached as a whole, so running build_assets.py takes effect without a restart
+    static_path = os.path.join(STATIC_DIR, BACKGROUND_FILE)
+    if os.path.exists(static_path):
+        # Versioned URL so the browser can cache the file for good
+        return get_static_url(static_path, os.path.getmtime(static_path))
+    bg_image = get_base64_image("image.jpg")
+    if bg_image:
+        warn_missing_static(static_path)
+        return f"data:image/jpeg;base64,{bg_image}"
+    return None
+
+bg_url = get_background_url()
 
 # Build CSS with background image
 css_content = "<style>"
 
 # Add background image if available
-if bg_image:
+if bg_url:
     css_content += f"""
     .stApp {{
-        background-image: linear-gradient(rgba(0, 0, 0, 0.5), rgba(0, 0, 0, 0.5)), url("data:image/jpeg;base64,{bg_image}");
+        background-image: linear-gradient(rgba(0, 0, 0, 0.5), rgba(0, 0, 0, 0.5)), url("{bg_url}");
         background-size: cover;
         background-position: center;
         background-repeat: no-repeat;
@@ -137,6 +168,13 @@ def get_model():
 
 model = get_model()
 
+# Shared by every session so all LLM calls go through one queue
+@st.cache_resource
+def get_admission():
+    return controller_from_env()
+
+admission = get_admission()
+
 # Prompt templates
 rag_template = """
 You are a friendly pizza restaurant assistant. You can answer questions about the restaurant based on customer reviews.
@@ -239,6 +277,17 @@ with st.sidebar:
         st.caption(f"{row['Date'].strftime('%Y-%m-%d')}")
         st.markdown("---")
     
+    # LLM load
+    st.subheader("Assistant Load")
+    load = admission.metrics()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Queued", load["queue_depth"])
+    with col2:
+        st.metric("Avg Wait", f"{load['avg_wait']:.1f}s")
+    with col3:
+        st.metric("Shed", load["shed"] + load["timed_out"])
+    
     # Clear chat button
     if st.button("🗑️ Start New Chat", key="clear_btn"):
         st.session_state.messages = []
@@ -406,11 +455,14 @@ if submit_button and user_input:
                     for i, doc in enumerate(reviews)
                 ])
                 
-                # Generate response
-                response = rag_chain.invoke({
-                    "reviews": reviews_text,
-                    "question": user_input
-                })
+                # Generate response, or answer from the reviews if the LLM is overloaded
+                try:
+                    response = admission.run(rag_chain.invoke, {
+                        "reviews": reviews_text,
+                        "question": user_input
+                    })
+                except OverloadedError:
+                    response = degraded_answer(reviews)
                 
                 st.session_state.messages.append({"role": "assistant", "content": response})
         
@@ -0,0 +1,58 @@
+"""
+Build the static assets served by the Streamlit app.
+
+Resizes and recompresses the background image once, at build time, and writes
+it to the static/ folder so Streamlit can serve it as a cacheable file instead
+of inlining it as base64 on every rerun.
+
+Usage (from the src directory):
+    python build_assets.py
+"""
+import hashlib
+import os
+
+SOURCE_IMAGE = "image.jpg"
+STATIC_DIR = "static"
+BACKGROUND_FILE = "background.jpg"
+
+# Large enough for full-HD screens with background-size: cover
+MAX_WIDTH = 1920
+MAX_HEIGHT = 1080
+JPEG_QUALITY = 75
+
+
+def build_background(source=SOURCE_IMAGE, static_dir=STATIC_DIR):
+    """
+    Resize and compress the background image into the static folder.
+    Returns the path of the written file.
+    """
+    # Imported here so app.py can use the constants without loading Pillow
+    from PIL import Image
+
+    os.makedirs(static_dir, exist_ok=True)
+    target = os.path.join(static_dir, BACKGROUND_FILE)
+
+    with Image.open(source) as img:
+        img = img.convert("RGB")
+        img.thumbnail((MAX_WIDTH, MAX_HEIGHT), Image.LANCZOS)
+        img.save(target, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+
+    return target
+
+
+def file_version(path):
+    """Short content hash used to version static URLs for long-lived caching"""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+
+if __name__ == "__main__":
+    if not os.path.exists(SOURCE_IMAGE):
+        raise SystemExit(f"Source image not found: {SOURCE_IMAGE}")
+
+    before = os.path.getsize(SOURCE_IMAGE)
+    target = build_background()
+    after = os.path.getsize(target)
+
+    print(f"Background: {SOURCE_IMAGE} ({before:,} bytes) -> {target} ({after:,} bytes)")
+    print(f"Version: {file_version(target)}")
@@ -2,8 +2,10 @@ from langchain_ollama.llms import OllamaLLM
 from langchain_core.prompts import ChatPromptTemplate
 from vector import retriever
 from order_tool import send_order_email, is_order_intent
+from admission import controller_from_env, degraded_answer, OverloadedError
 
 model = OllamaLLM(model="llama3.2")
+admission = controller_from_env()
 
 # Normal RAG template
 rag_template = """
@@ -84,8 +86,16 @@ def collect_order_details():
     
     return order_data
 
+def print_metrics():
+    """Show LLM queue metrics"""
+    m = admission.metrics()
+    print("\n--- LLM Load ---")
+    print(f"Queued: {m['queue_depth']}  In flight: {m['in_flight']}")
+    print(f"Admitted: {m['admitted']}  Shed: {m['shed']}  Timed out: {m['timed_out']}")
+    print(f"Wait: {m['avg_wait']:.1f}s avg, {m['max_wait']:.1f}s max")
+
 print("Restaurant Review & Order System")
-print("Commands: 'q' to quit")
+print("Commands: 'q' to quit, 'stats' for LLM load")
 print("-" * 50)
 
 while True:
@@ -93,8 +103,13 @@ while True:
     question = input("Ask your question (q to quit): ")
     
     if question == "q":
+        print_metrics()
         break
     
+    if question == "stats":
+        print_metrics()
+        continue
+    
     # Check if it's an order intent
     if is_order_intent(question):
         order_data = collect_order_details()
@@ -111,5 +126,8 @@ while True:
     
     # Normal RAG flow
     reviews = retriever.invoke(question)
-    result = rag_chain.invoke({"reviews": reviews, "question": question})
+    try:
+        result = admission.run(rag_chain.invoke, {"reviews": reviews, "question": question})
+    except OverloadedError:
+        result = degraded_answer(reviews)
     print(result)
\ No newline at end of file
@@ -0,0 +1,135 @@
+"""
+Prebuilt index snapshots.
+
+Exports the Chroma collection (ids, documents, metadata and embeddings) into a
+single compressed, versioned file tied to the embedding model that produced it.
+A fresh container can restore the index from the snapshot at startup instead of
+re-embedding the whole review CSV through Ollama.
+
+Usage (from the src directory, with a built index):
+    python snapshot.py export
+"""
+import hashlib
+import json
+import os
+import zipfile
+import numpy as np
+
+FORMAT_VERSION = 1
+SNAPSHOT_LOCATION = "./index_snapshot.npz"
+
+
+def _checksum(embeddings, records):
+    digest = hashlib.sha256()
+    digest.update(embeddings.tobytes())
+    digest.update(records.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def export_snapshot(vector_store, embedding_model, path=SNAPSHOT_LOCATION):
+    """
+    Write every entry of the vector store to a snapshot file.
+    Returns the number of exported entries.
+    Raises ValueError if the vector store is empty.
+    """
+    data = vector_store.get(include=["embeddings", "documents", "metadatas"])
+    if not data["ids"]:
+        raise ValueError("Vector store is empty, nothing to export")
+    embeddings = np.asarray(data["embeddings"], dtype=np.float32)
+
+    records = json.dumps({
+        "ids": data["ids"],
+        "documents": data["documents"],
+        "metadatas": data["metadatas"],
+    })
+    header = json.dumps({
+        "format_version": FORMAT_VERSION,
+        "embedding_model": embedding_model,
+        "count": len(data["ids"]),
+        "dimension": embeddings.shape[1] if embeddings.ndim == 2 else 0,
+        "checksum": _checksum(embeddings, records),
+    })
+
+    with open(path, "wb") as f:
+        np.savez_compressed(f, header=np.array(header), records=np.array(records), embeddings=embeddings)
+
+    return len(data["ids"])
+
+
+def load_snapshot(path, embedding_model):
+    """
+    Read and verify a snapshot file.
+    Raises ValueError if the file can't be read, is from another format version
+    or embedding model, fails its checksum, or its sizes don't match the header.
+    """
+    try:
+        with np.load(path) as archive:
+            header = json.loads(str(archive["header"]))
+            records = str(archive["records"])
+            embeddings = archive["embeddings"]
+        snapshot = json.loads(records)
+        ids = snapshot["ids"]
+        version = header["format_version"]
+        model = header["embedding_model"]
+        count = header["count"]
+        dimension = header["dimension"]
+        checksum = header["checksum"]
+    except (OSError, EOFError, zipfile.BadZipFile, KeyError, TypeError, ValueError) as e:
+        # json.JSONDecodeError is a ValueError too
+        raise ValueError(f"Unreadable snapshot: {e!r}") from e
+
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format version: {version}")
+    if model != embedding_model:
+        raise ValueError(f"Snapshot was built with '{model}', expected '{embedding_model}'")
+    if _checksum(embeddings, records) != checksum:
+        raise ValueError("Snapshot checksum mismatch")
+    if embeddings.ndim != 2 or not (len(ids) == count == embeddings.shape[0]):
+        raise ValueError(f"Snapshot has {len(ids)} ids and {embeddings.shape} embeddings, header says {count}")
+    if embeddings.shape[1] != dimension:
+        raise ValueError(f"Snapshot embeddings have dimension {embeddings.shape[1]}, header says {dimension}")
+    if not (len(snapshot["documents"]) == len(snapshot["metadatas"]) == count):
+        raise ValueError("Snapshot documents and metadata don't match the ids")
+
+    snapshot["embeddings"] = embeddings
+    return snapshot
+
+
+def restore_snapshot(vector_store, snapshot):
+    """
+    Add the snapshot entries to the vector store without calling the embedding model.
+    Raises ValueError if the entries couldn't be added; anything partly added is removed.
+    """
+    # Goes straight to the Chroma collection: the LangChain wrapper always re-embeds
+    try:
+        vector_store._collection.upsert(
+            ids=snapshot["ids"],
+            embeddings=snapshot["embeddings"],
+            documents=snapshot["documents"],
+            metadatas=snapshot["metadatas"],
+        )
+    except Exception as e:
+        # Don't leave a half-filled collection behind, the caller rebuilds from the CSV
+        try:
+            vector_store._collection.delete(ids=snapshot["ids"])
+        except Exception:
+            pass
+        raise ValueError(f"Couldn't restore snapshot: {e!r}") from e
+    return len(snapshot["ids"])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Index snapshot tools")
+    parser.add_argument("command", choices=["export"])
+    parser.add_argument("--path", default=SNAPSHOT_LOCATION)
+    args = parser.parse_args()
+
+    from vector import vector_store, EMBEDDING_MODEL
+
+    try:
+        count = export_snapshot(vector_store, EMBEDDING_MODEL, path=args.path)
+    except ValueError as e:
+        raise SystemExit(f"Export failed: {e}")
+    print(f"Exported {count} entries ({EMBEDDING_MODEL}) to {args.path} ({os.path.getsize(args.path):,} bytes)")
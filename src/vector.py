@@ -1,19 +1,41 @@
 from langchain_ollama import OllamaEmbeddings
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
+from snapshot import SNAPSHOT_LOCATION, load_snapshot, restore_snapshot
+import logging
 import os
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "mxbai-embed-large"
+
 df = pd.read_csv("realistic_restaurant_reviews.csv")
-embeddings = OllamaEmbeddings(model="mxbai-embed-large")
+embeddings = OllamaEmbeddings(model=EMBEDDING_MODEL)
 
 db_location = "./chrome_langchain_db"
-add_documents_flag = not os.path.exists(db_location)
+# An empty directory counts as missing (e.g. a fresh Docker volume mount)
+add_documents_flag = not os.path.exists(db_location) or not os.listdir(db_location)
+
+vector_store = Chroma(
+    collection_name="restaurant_reviews",
+    persist_directory=db_location,
+    embedding_function=embeddings
+)
+
+if add_documents_flag and os.path.exists(SNAPSHOT_LOCATION):
+    # Restore the prebuilt index instead of embedding every review
+    try:
+        snapshot = load_snapshot(SNAPSHOT_LOCATION, EMBEDDING_MODEL)
+        restore_snapshot(vector_store, snapshot)
+        add_documents_flag = False
+    except ValueError as e:
+        logger.warning("Ignoring index snapshot: %s", e)
 
 if add_documents_flag:
     documents = []
     ids = []
-    
+
     for i, row in df.iterrows():
         document = Document(
             page_content=row["Title"] + " " + row["Review"],
@@ -22,16 +44,9 @@ if add_documents_flag:
         )
         ids.append(str(i))
         documents.append(document)
-        
-vector_store = Chroma(
-    collection_name="restaurant_reviews",
-    persist_directory=db_location,
-    embedding_function=embeddings
-)
 
-if add_documents_flag:
     vector_store.add_documents(documents=documents, ids=ids)
-    
+
 retriever = vector_store.as_retriever(
     search_kwargs={"k": 5}
-)
\ No newline at end of file
+)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The app modules live flat in src/ and are run from there
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
@@ -0,0 +1,141 @@
+import threading
+import time
+
+import pytest
+
+from admission import AdmissionController, OverloadedError, degraded_answer
+
+
+def start(controller, fn, payload, results, key):
+    def target():
+        try:
+            results[key] = controller.run(fn, payload)
+        except OverloadedError as e:
+            results[key] = e
+    thread = threading.Thread(target=target)
+    thread.start()
+    return thread
+
+
+def test_returns_result_and_propagates_errors():
+    controller = AdmissionController(deadline=1.0, service_estimate=0.1)
+    assert controller.run(lambda x: x * 2, 21) == 42
+    with pytest.raises(ZeroDivisionError):
+        controller.run(lambda x: 1 / x, 0)
+    assert controller.metrics()["in_flight"] == 0
+
+
+def test_recovers_after_one_slow_call():
+    controller = AdmissionController(deadline=1.0, service_estimate=0.3)
+    with pytest.raises(OverloadedError):
+        controller.run(time.sleep, 1.5)
+    time.sleep(0.6)  # let the abandoned call finish
+
+    # Ollama is fast again: calls get through instead of being shed forever
+    for _ in range(3):
+        assert controller.run(lambda x: x, "ok") == "ok"
+    assert controller.metrics()["admitted"] == 4
+    assert controller._avg_service < 1.0
+
+
+def test_idle_probe_is_admitted_even_with_high_estimate():
+    controller = AdmissionController(deadline=1.0, service_estimate=5.0)
+    assert controller.run(lambda x: x, "probe") == "probe"
+
+
+def test_cold_start_burst_is_shed_up_front():
+    controller = AdmissionController(max_queue=8, deadline=1.0, service_estimate=0.6)
+    results = {}
+    threads = [start(controller, time.sleep, 0.6, results, 0)]
+    time.sleep(0.05)
+    began = time.monotonic()
+    threads += [start(controller, time.sleep, 0.6, results, i) for i in range(1, 4)]
+    for thread in threads:
+        thread.join()
+
+    assert results[0] is None
+    assert all(isinstance(results[i], OverloadedError) for i in range(1, 4))
+    assert controller.metrics()["admitted"] == 1
+    assert controller.metrics()["shed"] == 3
+    # The shed requests never sat in the queue
+    assert controller.metrics()["max_wait"] < 0.1
+    assert time.monotonic() - began < 0.7
+
+
+def test_hung_call_sheds_new_requests_up_front():
+    controller = AdmissionController(deadline=0.5, service_estimate=0.1)
+    release = threading.Event()
+    with pytest.raises(OverloadedError):
+        controller.run(lambda _: release.wait(), None)
+
+    began = time.monotonic()
+    with pytest.raises(OverloadedError, match="current load"):
+        controller.run(lambda x: x, "late")
+    assert time.monotonic() - began < 0.1
+    release.set()
+
+
+def test_late_slot_is_not_sent_to_backend():
+    controller = AdmissionController(max_concurrent=2, deadline=1.0, service_estimate=0.3)
+    executed = []
+
+    def call(seconds):
+        executed.append(seconds)
+        time.sleep(seconds)
+
+    results = {}
+    threads = [start(controller, call, 0.6, results, 0), start(controller, call, 0.95, results, 1)]
+    time.sleep(0.15)
+    # Looks feasible on arrival, but once a slot frees up the other call has
+    # been running longer than the time left, so it is shed without running
+    threads.append(start(controller, call, 0.01, results, 2))
+    for thread in threads:
+        thread.join()
+
+    assert sorted(executed) == [0.6, 0.95]
+    assert "not enough time left" in str(results[2])
+
+
+def test_queue_full_is_shed():
+    controller = AdmissionController(max_queue=1, deadline=2.0, service_estimate=0.01)
+    release = threading.Event()
+    results = {}
+    threads = [start(controller, lambda _: release.wait(0.3), None, results, 0)]
+    time.sleep(0.05)
+    threads.append(start(controller, lambda x: x, 1, results, 1))
+    time.sleep(0.05)
+    with pytest.raises(OverloadedError, match="queue is full"):
+        controller.run(lambda x: x, 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results[1] == 1
+
+
+def test_slots_are_granted_in_arrival_order():
+    controller = AdmissionController(max_queue=10, deadline=5.0, service_estimate=0.01)
+    order = []
+    release = threading.Event()
+    results = {}
+    threads = [start(controller, lambda _: release.wait(), None, results, "blocker")]
+    time.sleep(0.05)
+    for i in range(5):
+        threads.append(start(controller, order.append, i, results, i))
+        time.sleep(0.02)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert order == [0, 1, 2, 3, 4]
+
+
+def test_degraded_answer_uses_top_reviews():
+    class Doc:
+        def __init__(self, text, rating):
+            self.page_content = text
+            self.metadata = {"rating": rating}
+
+    answer = degraded_answer([Doc("word " * 100, 5), Doc("Cold pizza", 2), Doc("c", 3), Doc("d", 4)])
+    assert "(5/5)" in answer and "(2/5) Cold pizza" in answer
+    assert "(4/5)" not in answer
+    assert "..." in answer
+    assert "couldn't find" in degraded_answer([])